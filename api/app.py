@@ -13,6 +13,7 @@ import base64
 import ssl
 import certifi
 import traceback
+from audio_processing import InboundAudioProcessor, SUPPORTED_SAMPLE_RATES, TARGET_SAMPLE_RATE
 
 load_dotenv()
 
@@ -30,6 +31,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inbound audio gating - drop silent frames before forwarding to Gemini
+audio_vad_enabled = os.getenv("AUDIO_VAD_ENABLED", "false").lower() == "true"
+audio_vad_threshold_dbfs = float(os.getenv("AUDIO_VAD_THRESHOLD_DBFS", "-45"))
+audio_vad_hangover_ms = int(os.getenv("AUDIO_VAD_HANGOVER_MS", "400"))
+audio_vad_keep_every = int(os.getenv("AUDIO_VAD_KEEP_EVERY", "0"))
+
+# After an interruption, upstream content counts as a late chunk of the
+# cancelled turn until turnComplete, or until this long after the interrupt
+LATE_CHUNK_WINDOW_SECONDS = 0.5
+
 
 # Request/Response Models
 class ExtractRequirementsRequest(BaseModel):
@@ -498,7 +509,12 @@ Be direct and constructive. The goal is to help them improve, not make them feel
 
 
 @app.websocket("/ws/interview")
-async def websocket_interview(websocket: WebSocket, role: str = "this position", company: str = ""):
+async def websocket_interview(
+    websocket: WebSocket,
+    role: str = "this position",
+    company: str = "",
+    sample_rate: int = TARGET_SAMPLE_RATE,
+):
     """
     WebSocket endpoint for live audio interview streaming.
     Proxies audio between client and Gemini Live API.
@@ -506,6 +522,7 @@ async def websocket_interview(websocket: WebSocket, role: str = "this position",
     Query params:
     - role: Job role/title
     - company: Company name (optional)
+    - sample_rate: Sample rate of the client's Int16 PCM (resampled to 16kHz server-side)
     """
     print(f"[WebSocket] New connection request - Role: {role}, Company: {company}")
     await websocket.accept()
@@ -516,9 +533,24 @@ async def websocket_interview(websocket: WebSocket, role: str = "this position",
         await websocket.close(code=1008, reason="GEMINI_API_KEY not configured")
         return
 
+    if sample_rate not in SUPPORTED_SAMPLE_RATES:
+        await websocket.close(code=1003, reason=f"Unsupported sample_rate: {sample_rate}")
+        return
+
     gemini_ws = None
     conversation_log = []  # Track conversation for feedback
 
+    # Only run the audio stage when there is work for it to do
+    audio_processor = None
+    if audio_vad_enabled or sample_rate != TARGET_SAMPLE_RATE:
+        audio_processor = InboundAudioProcessor(
+            source_rate=sample_rate,
+            vad_enabled=audio_vad_enabled,
+            threshold_dbfs=audio_vad_threshold_dbfs,
+            hangover_ms=audio_vad_hangover_ms,
+            keep_every=audio_vad_keep_every,
+        )
+
     try:
         # Connect to Gemini Live API
         gemini_url = f"wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1alpha.GenerativeService.BidiGenerateContent?key={api_key}"
@@ -573,17 +605,25 @@ Start by briefly introducing yourself and asking the first question."""
                 while True:
                     audio_chunk = await websocket.receive_bytes()
 
-                    # Convert to base64 and send to Gemini with proper sample rate
-                    audio_b64 = base64.b64encode(audio_chunk).decode('utf-8')
-                    message = {
-                        "realtime_input": {
-                            "media_chunks": [{
-                                "mime_type": "audio/pcm;rate=16000",  # Specify 16kHz sample rate
-                                "data": audio_b64
-                            }]
+                    if audio_processor:
+                        audio_chunk = audio_processor.process(audio_chunk)
+
+                    if audio_chunk:
+                        # Convert to base64 and send to Gemini with proper sample rate
+                        audio_b64 = base64.b64encode(audio_chunk).decode('utf-8')
+                        message = {
+                            "realtime_input": {
+                                "media_chunks": [{
+                                    "mime_type": "audio/pcm;rate=16000",  # Specify 16kHz sample rate
+                                    "data": audio_b64
+                                }]
+                            }
                         }
-                    }
-                    await gemini_ws.send(json.dumps(message))
+                        await gemini_ws.send(json.dumps(message))
+
+                    # VAD gate closed - tell Gemini the stream paused so it can end the turn
+                    if audio_processor and audio_processor.pop_stream_end():
+                        await gemini_ws.send(json.dumps({"realtime_input": {"audio_stream_end": True}}))
 
             except WebSocketDisconnect:
                 print("[Client→Gemini] Client disconnected")
@@ -591,8 +631,37 @@ Start by briefly introducing yourself and asking the first question."""
                 print(f"[Client→Gemini] ERROR: {e}")
                 traceback.print_exc()
 
+        # Outbound audio is queued so an interruption can cancel everything the
+        # candidate talked over. Each frame is prefixed with its turn generation
+        # (uint32 little-endian) so the client can reject stale audio too.
+        outbound_audio = asyncio.Queue()
+        turn_generation = 0
+        turn_cancelled = False  # Dropping late chunks of an interrupted turn
+        interrupted_at = 0.0
+
+        def flush_outbound_audio():
+            dropped = 0
+            while not outbound_audio.empty():
+                dropped += len(outbound_audio.get_nowait()) - 4
+            return dropped
+
+        # Task to send queued Gemini audio to client
+        async def audio_to_client():
+            try:
+                while True:
+                    frame = await outbound_audio.get()
+                    await websocket.send_bytes(frame)
+                    print(f"[Server→Client] Sent {len(frame) - 4} audio bytes")
+            except WebSocketDisconnect:
+                print("[Server→Client] Client disconnected")
+            except Exception as e:
+                print(f"[Server→Client] ERROR: {e}")
+                traceback.print_exc()
+
         # Task to forward audio from Gemini to client
         async def gemini_to_client():
+            nonlocal turn_generation, turn_cancelled, interrupted_at
+            loop = asyncio.get_running_loop()
             try:
                 async for message in gemini_ws:
                     data = json.loads(message)
@@ -605,15 +674,34 @@ Start by briefly introducing yourself and asking the first question."""
                     if "serverContent" in data:
                         server_content = data["serverContent"]
 
-                        # Log interrupted flag
-                        if "interrupted" in server_content:
-                            print(f"[Gemini] Interrupted: {server_content['interrupted']}")
+                        # Candidate barged in - cancel the current turn's audio
+                        if server_content.get("interrupted"):
+                            turn_generation += 1
+                            turn_cancelled = True
+                            interrupted_at = loop.time()
+                            dropped = flush_outbound_audio()
+                            await websocket.send_text(json.dumps({
+                                "type": "interrupted",
+                                "generation": turn_generation
+                            }))
+                            print(f"[Gemini] Interrupted: dropped {dropped} queued audio bytes, generation {turn_generation}")
 
                         # Handle model's response
                         if "modelTurn" in server_content:
                             parts = server_content["modelTurn"].get("parts", [])
                             print(f"[Gemini] modelTurn with {len(parts)} parts")
 
+                            # Past the late-chunk window this is the next response, not
+                            # the tail of the interrupted one
+                            if turn_cancelled and loop.time() - interrupted_at > LATE_CHUNK_WINDOW_SECONDS:
+                                turn_cancelled = False
+                                turn_generation += 1
+                                print(f"[Gemini] New turn after interruption, generation {turn_generation}")
+
+                            if turn_cancelled:
+                                print(f"[Gemini] Dropped late modelTurn from interrupted turn")
+                                parts = []
+
                             # Log if there's text (means Gemini is responding to speech)
                             for part in parts:
                                 if "text" in part:
@@ -626,19 +714,21 @@ Start by briefly introducing yourself and asking the first question."""
                                     data_length = len(part["inlineData"].get("data", ""))
                                     print(f"[Gemini] Audio chunk: {mime_type}, {data_length} bytes")
 
-                            # Send audio back to client
+                            # Queue audio for the client, tagged with the current turn
                             for part in parts:
                                 if "inlineData" in part:
                                     audio_b64 = part["inlineData"].get("data", "")
                                     if audio_b64:
-                                        # Decode and send to client
                                         audio_bytes = base64.b64decode(audio_b64)
-                                        await websocket.send_bytes(audio_bytes)
-                                        print(f"[Server→Client] Sent {len(audio_bytes)} audio bytes")
+                                        outbound_audio.put_nowait(turn_generation.to_bytes(4, "little") + audio_bytes)
 
                         # Check if Gemini detected turn complete
                         if "turnComplete" in server_content:
                             print(f"[Gemini] Turn complete detected: {server_content['turnComplete']}")
+                            # Interrupted turn is over - next audio starts a new generation
+                            if turn_cancelled:
+                                turn_cancelled = False
+                                turn_generation += 1
 
                         # Check for grounding metadata
                         if "groundingMetadata" in server_content:
@@ -673,11 +763,17 @@ Start by briefly introducing yourself and asking the first question."""
                 print(f"[Gemini→Client] ERROR: {e}")
                 traceback.print_exc()
 
-        # Run both tasks concurrently
-        await asyncio.gather(
-            client_to_gemini(),
-            gemini_to_client()
-        )
+        # Run all tasks concurrently; when any one ends (disconnect, upstream
+        # close or failed send), tear down the rest so nothing is left running
+        tasks = [
+            asyncio.create_task(client_to_gemini()),
+            asyncio.create_task(gemini_to_client()),
+            asyncio.create_task(audio_to_client())
+        ]
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     except WebSocketDisconnect:
         print("[WebSocket] Client disconnected")
@@ -689,6 +785,8 @@ Start by briefly introducing yourself and asking the first question."""
         except:
             pass
     finally:
+        if audio_processor:
+            print(f"[Audio] Session stats: {audio_processor.summary()}")
         if gemini_ws:
             try:
                 await gemini_ws.close()
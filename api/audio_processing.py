@@ -0,0 +1,202 @@
+"""
+Server-side processing for inbound interview audio.
+
+Resamples client PCM to the 16kHz mono Int16 format expected by the Gemini
+Live API and gates out silent frames before they are forwarded upstream.
+"""
+
+from math import gcd
+import time
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+FRAME_MS = 20  # VAD decision granularity
+
+# Standard device rates only - filter size grows with the reduced up/down ratio,
+# so arbitrary rates (e.g. 191999) would allocate huge polyphase matrices
+SUPPORTED_SAMPLE_RATES = (8000, 11025, 16000, 22050, 24000, 32000, 44100, 48000, 88200, 96000)
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational-ratio resampler (up/down polyphase FIR).
+
+    Keeps just enough input history between chunks that consecutive calls
+    produce the same output as resampling the concatenated stream.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE, half_width: int = 16):
+        if source_rate not in SUPPORTED_SAMPLE_RATES:
+            raise ValueError(f"Unsupported sample rate: {source_rate}")
+
+        divisor = gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+
+        # Windowed-sinc lowpass at the narrower of the two Nyquist bands
+        factor = max(self.up, self.down)
+        num_taps = 2 * half_width * factor + 1
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = np.sinc(n / factor) / factor * np.kaiser(num_taps, 8.0)
+        taps *= self.up  # Compensate for zero-stuffing gain
+
+        # Polyphase matrix: phases[p, j] = taps[p + j * up]
+        self.taps_per_phase = -(-num_taps // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up)
+        padded[:num_taps] = taps
+        self.phases = padded.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+
+        # Input history, primed with zeros so the first outputs have full windows
+        self._buffer = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._buffer_start = -(self.taps_per_phase - 1)  # Absolute index of _buffer[0]
+        self._next_output = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample a chunk of float32 samples, returning all outputs now computable."""
+        buffer = np.concatenate([self._buffer, samples.astype(np.float32, copy=False)])
+        total_inputs = self._buffer_start + len(buffer)
+
+        last_output = (total_inputs * self.up - 1) // self.down
+        outputs = np.arange(self._next_output, last_output + 1, dtype=np.int64)
+
+        if len(outputs):
+            positions = outputs * self.down
+            phase = positions % self.up
+            base = positions // self.up - self._buffer_start
+            window = base[:, None] - np.arange(self.taps_per_phase)[None, :]
+            result = np.einsum("ij,ij->i", self.phases[phase], buffer[window])
+            self._next_output = last_output + 1
+        else:
+            result = np.zeros(0, dtype=np.float32)
+
+        # Drop history the next output no longer needs
+        next_base = (self._next_output * self.down) // self.up
+        keep_from = next_base - (self.taps_per_phase - 1)
+        self._buffer = buffer[keep_from - self._buffer_start:]
+        self._buffer_start = keep_from
+
+        return result.astype(np.float32, copy=False)
+
+
+class InboundAudioProcessor:
+    """
+    Per-session inbound audio stage: resample to 16kHz, then energy-gate.
+
+    Frames whose RMS level is below `threshold_dbfs` are treated as silence.
+    Silence is still forwarded for `hangover_ms` after speech; beyond that,
+    only every `keep_every`-th silent frame is forwarded (0 drops them all).
+    Each time the gate closes, `pop_stream_end()` reports it once so the
+    caller can send `audio_stream_end` - the Live API only counts silence it
+    receives, so without it end of turn would never be detected.
+    """
+
+    def __init__(
+        self,
+        source_rate: int = TARGET_SAMPLE_RATE,
+        vad_enabled: bool = True,
+        threshold_dbfs: float = -45.0,
+        hangover_ms: int = 400,
+        keep_every: int = 0,
+    ):
+        self.source_rate = source_rate
+        self.resampler = PolyphaseResampler(source_rate) if source_rate != TARGET_SAMPLE_RATE else None
+        self.vad_enabled = vad_enabled
+        self.threshold = 10 ** (threshold_dbfs / 20)
+        self.frame_size = TARGET_SAMPLE_RATE * FRAME_MS // 1000
+        self.hangover_frames = hangover_ms // FRAME_MS
+        self.keep_every = keep_every
+
+        self._pending = np.zeros(0, dtype=np.float32)  # Partial frame carried to next chunk
+        self._silent_run = self.hangover_frames + 1  # Start closed until speech is heard
+        self._stream_end_pending = False
+
+        self.stats = {
+            "frames_total": 0,
+            "frames_suppressed": 0,
+            "bytes_in": 0,
+            "bytes_removed_by_resampling": 0,
+            "bytes_added_by_resampling": 0,  # Upsampling from 8k/11.025k
+            "bytes_dropped_by_vad": 0,
+            "bytes_out": 0,
+            "stream_ends": 0,
+            "cpu_seconds": 0.0,
+        }
+
+    def process(self, chunk: bytes) -> bytes:
+        """Process one client chunk of Int16 PCM, returning the bytes to forward (may be empty)."""
+        started = time.process_time()
+        self.stats["bytes_in"] += len(chunk)
+
+        samples = np.frombuffer(chunk[:len(chunk) - len(chunk) % 2], dtype="<i2").astype(np.float32) / 32768.0
+        if self.resampler is not None:
+            resampled = self.resampler.process(samples)
+            delta = (len(samples) - len(resampled)) * 2
+            if delta >= 0:
+                self.stats["bytes_removed_by_resampling"] += delta
+            else:
+                self.stats["bytes_added_by_resampling"] -= delta
+            samples = resampled
+
+        if self.vad_enabled:
+            samples = self._gate(samples)
+
+        pcm = np.clip(np.round(samples * 32768.0), -32768, 32767).astype("<i2").tobytes()
+        self.stats["bytes_out"] += len(pcm)
+        self.stats["cpu_seconds"] += time.process_time() - started
+        return pcm
+
+    def _gate(self, samples: np.ndarray) -> np.ndarray:
+        samples = np.concatenate([self._pending, samples])
+        num_frames = len(samples) // self.frame_size
+        self._pending = samples[num_frames * self.frame_size:]
+        if num_frames == 0:
+            return samples[:0]
+
+        frames = samples[:num_frames * self.frame_size].reshape(num_frames, self.frame_size)
+        speech = np.sqrt(np.mean(frames * frames, axis=1)) >= self.threshold
+
+        # Length of the silent run each frame sits at (0 for speech), continuing
+        # the run carried over from the previous chunk
+        index = np.arange(num_frames)
+        last_speech = np.maximum.accumulate(np.where(speech, index, -1))
+        silent_run = np.where(
+            last_speech >= 0,
+            index - last_speech,
+            self._silent_run + index + 1,
+        )
+        # Gate closed if it was open at any point (entering or within this chunk)
+        # and is closed at the end of it
+        was_open = self._silent_run <= self.hangover_frames or bool(np.any(silent_run <= self.hangover_frames))
+        self._silent_run = int(silent_run[-1])
+        if was_open and self._silent_run > self.hangover_frames:
+            self._stream_end_pending = True
+            self.stats["stream_ends"] += 1
+
+        keep = silent_run <= self.hangover_frames
+        if self.keep_every > 0:
+            keep |= (silent_run - self.hangover_frames) % self.keep_every == 0
+
+        suppressed = int(num_frames - np.count_nonzero(keep))
+        self.stats["frames_total"] += num_frames
+        self.stats["frames_suppressed"] += suppressed
+        self.stats["bytes_dropped_by_vad"] += suppressed * self.frame_size * 2
+        return frames[keep].reshape(-1)
+
+    def pop_stream_end(self) -> bool:
+        """True once after each chunk in which the gate closed (speech paused)."""
+        pending = self._stream_end_pending
+        self._stream_end_pending = False
+        return pending
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (
+            f"{stats['frames_suppressed']}/{stats['frames_total']} frames suppressed, "
+            f"{stats['stream_ends']} stream ends, "
+            f"{stats['bytes_in']} bytes in, {stats['bytes_out']} bytes out "
+            f"({stats['bytes_removed_by_resampling']} removed and "
+            f"{stats['bytes_added_by_resampling']} added by resampling, "
+            f"{stats['bytes_dropped_by_vad']} dropped by VAD), "
+            f"{stats['cpu_seconds'] * 1000:.1f}ms CPU"
+        )
@@ -0,0 +1,73 @@
+"""
+Benchmark the inbound audio stage: CPU per session and upstream bytes saved.
+
+Feeds a synthetic interview session (speech bursts separated by background
+noise) through InboundAudioProcessor at common device rates and prints the
+per-session stats.
+
+Usage:
+    python bench_audio.py [--seconds 60] [--speech-ratio 0.3]
+"""
+
+import argparse
+
+import numpy as np
+
+from audio_processing import InboundAudioProcessor, TARGET_SAMPLE_RATE
+
+CHUNK_SAMPLES = 4096  # Matches the web client's ScriptProcessor buffer size
+
+
+def synthesize_session(sample_rate: int, seconds: int, speech_ratio: float, seed: int = 0) -> bytes:
+    """Int16 PCM of low-level noise with a voiced burst at the start of every 10s block."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(sample_rate * seconds) / sample_rate
+    signal = rng.normal(0, 0.001, len(t))
+
+    block = 10
+    speech_seconds = block * speech_ratio
+    in_speech = (t % block) < speech_seconds
+    # Harmonic "voice" with a slow amplitude envelope
+    voice = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((140, 280, 420, 560)))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    signal += np.where(in_speech, 0.15 * voice * envelope, 0)
+
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def run(sample_rate: int, seconds: int, speech_ratio: float, vad_enabled: bool) -> dict:
+    pcm = synthesize_session(sample_rate, seconds, speech_ratio)
+    processor = InboundAudioProcessor(source_rate=sample_rate, vad_enabled=vad_enabled)
+    chunk_bytes = CHUNK_SAMPLES * 2
+    for offset in range(0, len(pcm), chunk_bytes):
+        processor.process(pcm[offset:offset + chunk_bytes])
+    return processor.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--speech-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    baseline_bytes = TARGET_SAMPLE_RATE * 2 * args.seconds  # Unfiltered 16kHz stream
+    print(f"{args.seconds}s session, {args.speech_ratio:.0%} speech; unfiltered 16kHz upstream = {baseline_bytes} bytes\n")
+    print(f"{'rate':>6} {'vad':>4} {'cpu ms':>8} {'cpu %':>6} {'frames dropped':>15} {'bytes out':>10} {'saved vs 16k':>13}")
+
+    for sample_rate in (16000, 44100, 48000):
+        for vad_enabled in (False, True):
+            if sample_rate == TARGET_SAMPLE_RATE and not vad_enabled:
+                continue  # Relay bypasses the stage entirely
+            stats = run(sample_rate, args.seconds, args.speech_ratio, vad_enabled)
+            cpu_ms = stats["cpu_seconds"] * 1000
+            saved = 1 - stats["bytes_out"] / baseline_bytes
+            print(
+                f"{sample_rate:>6} {'on' if vad_enabled else 'off':>4} {cpu_ms:>8.1f} "
+                f"{cpu_ms / (args.seconds * 10):>5.2f}% "
+                f"{stats['frames_suppressed']:>6}/{stats['frames_total']:<8} "
+                f"{stats['bytes_out']:>10} {saved:>12.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Minimal stand-in for the Gemini Live API, built on websockets.serve.
+
+Each connection runs a scripted conversation: `script` is a list of
+serverContent payloads (or ("sleep", seconds) pauses) sent after the relay's
+initial prompt arrives. Send times of every message are recorded so tests can
+measure latency against them.
+"""
+
+import asyncio
+import base64
+import json
+import time
+
+import websockets
+
+
+def audio_part(num_samples: int = 2400, value: int = 1) -> dict:
+    """A modelTurn audio part of Int16 PCM (2400 samples = 100ms at 24kHz)."""
+    pcm = value.to_bytes(2, "little", signed=True) * num_samples
+    return {"inlineData": {"mimeType": "audio/pcm;rate=24000", "data": base64.b64encode(pcm).decode()}}
+
+
+def model_audio(value: int = 1) -> dict:
+    return {"modelTurn": {"parts": [audio_part(value=value)]}}
+
+
+class FakeLiveServer:
+    def __init__(self, script: list):
+        self.script = script
+        self.sent_at = []  # (perf_counter, payload) for every scripted message
+        self.closed = asyncio.Event()  # Set once the relay hangs up
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}"
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, ws, path=None):
+        await ws.recv()  # setup
+        await ws.send(json.dumps({"setupComplete": {}}))
+        await ws.recv()  # initial prompt
+
+        try:
+            await self._play(ws)
+        except websockets.ConnectionClosed:
+            pass
+
+        # Hold the session open until the relay hangs up
+        await ws.wait_closed()
+        self.closed.set()
+
+    async def _play(self, ws):
+        for step in self.script:
+            if isinstance(step, tuple) and step[0] == "sleep":
+                await asyncio.sleep(step[1])
+                continue
+            self.sent_at.append((time.perf_counter(), step))
+            await ws.send(json.dumps({"serverContent": step}))
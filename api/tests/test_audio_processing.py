@@ -0,0 +1,149 @@
+"""
+Inbound audio stage: streaming resampler, VAD gate and its stats.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import app as api
+from audio_processing import (
+    SUPPORTED_SAMPLE_RATES,
+    TARGET_SAMPLE_RATE,
+    InboundAudioProcessor,
+    PolyphaseResampler,
+)
+
+FRAME_SAMPLES = 320  # 20ms at 16kHz
+SPEECH, SILENCE = "S", "."
+
+
+def tone(rate: int, freq: float, seconds: float = 1.0, amplitude: float = 0.5) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def level_db(samples: np.ndarray, amplitude: float = 0.5) -> float:
+    return 20 * np.log10(np.sqrt(np.mean(samples ** 2)) / (amplitude / np.sqrt(2)))
+
+
+def frames_pcm(pattern: str) -> bytes:
+    """16kHz PCM with one constant-valued frame per pattern character.
+
+    Frame i holds 10000 + i when speech and i + 1 (well under -45 dBFS) when
+    silent, so forwarded frames can be mapped back to their index.
+    """
+    values = [10000 + i if c == SPEECH else i + 1 for i, c in enumerate(pattern)]
+    return np.repeat(np.array(values, dtype="<i2"), FRAME_SAMPLES).tobytes()
+
+
+def kept_frames(pcm: bytes) -> list:
+    samples = np.frombuffer(pcm, dtype="<i2")
+    assert len(samples) % FRAME_SAMPLES == 0
+    return [int(v) - 10000 if v >= 10000 else int(v) - 1 for v in samples[::FRAME_SAMPLES]]
+
+
+def gate(pattern: str, chunk_bytes: int = None, **kwargs):
+    processor = InboundAudioProcessor(source_rate=TARGET_SAMPLE_RATE, hangover_ms=60, **kwargs)
+    pcm = frames_pcm(pattern)
+    chunk_bytes = chunk_bytes or len(pcm)
+    out, stream_ends = b"", []
+    for offset in range(0, len(pcm), chunk_bytes):
+        out += processor.process(pcm[offset:offset + chunk_bytes])
+        if processor.pop_stream_end():
+            stream_ends.append(offset)
+    return processor, kept_frames(out), stream_ends
+
+
+@pytest.mark.parametrize("rate", [r for r in SUPPORTED_SAMPLE_RATES if r != TARGET_SAMPLE_RATE])
+def test_resampling_is_independent_of_chunking(rate):
+    signal = np.random.default_rng(rate).normal(0, 0.2, rate).astype(np.float32)
+    whole = PolyphaseResampler(rate).process(signal)
+
+    resampler = PolyphaseResampler(rate)
+    sizes = np.random.default_rng(0).integers(1, 3000, len(signal))
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+    chunked = np.concatenate([
+        resampler.process(signal[start:end]) for start, end in zip(bounds[:-1], bounds[1:]) if start < len(signal)
+    ])
+
+    assert len(whole) == TARGET_SAMPLE_RATE
+    np.testing.assert_allclose(chunked, whole, atol=1e-6)
+
+
+@pytest.mark.parametrize("rate", [r for r in SUPPORTED_SAMPLE_RATES if r != TARGET_SAMPLE_RATE])
+def test_resampling_keeps_passband_and_rejects_above_nyquist(rate):
+    settle = slice(2000, -100)  # Skip filter warm-up and the unflushed tail
+    assert abs(level_db(PolyphaseResampler(rate).process(tone(rate, 1000))[settle])) < 0.1
+    if rate > 20000:
+        assert level_db(PolyphaseResampler(rate).process(tone(rate, 10000))[settle]) < -60
+
+
+def test_unsupported_resampler_rate_raises():
+    with pytest.raises(ValueError):
+        PolyphaseResampler(12345)
+
+
+def test_gate_drops_leading_silence_and_keeps_hangover():
+    processor, kept, stream_ends = gate("..SS" + "." * 6)
+    assert kept == [2, 3, 4, 5, 6]  # Speech plus 3 frames (60ms) of hangover
+    assert stream_ends == [0]
+    assert processor.pop_stream_end() is False  # Reported once per closing
+
+
+def test_gate_keep_every_thins_silence_past_hangover():
+    _, kept, _ = gate("S" + "." * 12, keep_every=4)
+    assert kept == [0, 1, 2, 3, 7, 11]
+
+
+def test_gate_is_independent_of_chunking():
+    pattern = "..SSS" + "." * 9 + "S." + "." * 8 + "SS" + "." * 5
+    _, whole, _ = gate(pattern, keep_every=3)
+    for chunk_bytes in (2, 500, 640, 1000, 2730):
+        _, chunked, stream_ends = gate(pattern, chunk_bytes=chunk_bytes, keep_every=3)
+        assert chunked == whole
+        assert len(stream_ends) == 3
+
+
+def test_gate_silent_run_continues_across_chunks():
+    processor = InboundAudioProcessor(source_rate=TARGET_SAMPLE_RATE, hangover_ms=60, keep_every=4)
+    pcm = frames_pcm("S" + "." * 12)
+    first = processor.process(pcm[:FRAME_SAMPLES * 2 * 5])  # Speech + 4 silent frames
+    assert processor.pop_stream_end() is True
+    second = processor.process(pcm[FRAME_SAMPLES * 2 * 5:])
+    assert processor.pop_stream_end() is False
+    assert kept_frames(first + second) == [0, 1, 2, 3, 7, 11]
+
+
+def test_stats_count_frames_and_bytes():
+    processor, kept, _ = gate("SS" + "." * 8)
+    stats = processor.stats
+    assert stats["frames_total"] == 10
+    assert stats["frames_suppressed"] == 10 - len(kept)
+    assert stats["bytes_in"] == 10 * FRAME_SAMPLES * 2
+    assert stats["bytes_out"] == len(kept) * FRAME_SAMPLES * 2
+    assert stats["bytes_dropped_by_vad"] == stats["frames_suppressed"] * FRAME_SAMPLES * 2
+    assert stats["stream_ends"] == 1
+    assert stats["bytes_removed_by_resampling"] == stats["bytes_added_by_resampling"] == 0
+
+
+@pytest.mark.parametrize("rate, removed", [(8000, False), (48000, True)])
+def test_stats_split_resampling_added_and_removed(rate, removed):
+    processor = InboundAudioProcessor(source_rate=rate, vad_enabled=False)
+    pcm = (tone(rate, 440) * 32767).astype("<i2").tobytes()
+    out = processor.process(pcm)
+    stats = processor.stats
+    assert stats["bytes_out"] == len(out)
+    assert (stats["bytes_removed_by_resampling"] > 0) is removed
+    assert (stats["bytes_added_by_resampling"] > 0) is not removed
+    delta = stats["bytes_removed_by_resampling"] - stats["bytes_added_by_resampling"]
+    assert stats["bytes_in"] - delta == stats["bytes_out"]
+
+
+def test_unsupported_sample_rate_closes_socket():
+    client = TestClient(api.app)
+    with client.websocket_connect("/ws/interview?sample_rate=12345") as ws:
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            ws.receive_bytes()
+    assert excinfo.value.code == 1003
@@ -0,0 +1,143 @@
+"""
+Barge-in handling in the /ws/interview relay, exercised end to end against
+a fake Live API server.
+"""
+
+import asyncio
+import contextlib
+import json
+import socket
+import time
+import types
+
+import uvicorn
+import websockets
+
+import app as api
+from fake_live import FakeLiveServer, model_audio
+
+MAX_INTERRUPT_TO_SILENCE_SECONDS = 0.25
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def relay(monkeypatch, fake: FakeLiveServer):
+    """Run the API in-process with its Gemini connection pointed at `fake`."""
+    monkeypatch.setattr(api, "websockets", types.SimpleNamespace(
+        connect=lambda url, ssl=None: websockets.connect(fake.url)
+    ))
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="error"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield f"ws://127.0.0.1:{port}/ws/interview"
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def collect(url: str, until, timeout: float = 2.0) -> list:
+    """Receive frames as (recv_time, kind, generation, first_sample) until `until(frames)`."""
+    frames = []
+    async with websockets.connect(url) as ws:
+        with contextlib.suppress(asyncio.TimeoutError):
+            while not until(frames):
+                message = await asyncio.wait_for(ws.recv(), timeout)
+                now = time.perf_counter()
+                if isinstance(message, str):
+                    control = json.loads(message)
+                    frames.append((now, control["type"], control["generation"], None))
+                else:
+                    generation = int.from_bytes(message[:4], "little")
+                    sample = int.from_bytes(message[4:6], "little", signed=True)
+                    frames.append((now, "audio", generation, sample))
+    return frames
+
+
+def test_interrupt_drops_late_chunks_until_next_turn(monkeypatch):
+    script = (
+        [model_audio(value=1) for _ in range(5)]
+        + [{"interrupted": True}]
+        + [model_audio(value=2) for _ in range(3)]  # Late chunks of the cancelled turn
+        + [{"turnComplete": True}]
+        + [model_audio(value=3) for _ in range(3)]  # Next turn
+        + [{"turnComplete": True}]
+    )
+
+    async def scenario():
+        async with FakeLiveServer(script) as fake, relay(monkeypatch, fake) as url:
+            return await collect(url, lambda frames: sum(f[3] == 3 for f in frames) == 3)
+
+    frames = asyncio.run(scenario())
+    kinds = [(kind, generation, sample) for _, kind, generation, sample in frames]
+
+    assert ("interrupted", 1, None) in kinds
+    interrupt_index = kinds.index(("interrupted", 1, None))
+    assert all(sample == 1 and generation == 0 for kind, generation, sample in kinds[:interrupt_index])
+    assert kinds[interrupt_index + 1:] == [("audio", 2, 3)] * 3
+
+
+def test_interrupt_without_turn_complete_resumes_after_window(monkeypatch):
+    script = (
+        [model_audio(value=1) for _ in range(3)]
+        + [{"interrupted": True}]
+        + [model_audio(value=2) for _ in range(3)]  # Late chunks, no turnComplete follows
+        + [("sleep", api.LATE_CHUNK_WINDOW_SECONDS + 0.2)]
+        + [model_audio(value=3) for _ in range(3)]  # Next response, chunks arriving back to back
+    )
+
+    async def scenario():
+        async with FakeLiveServer(script) as fake, relay(monkeypatch, fake) as url:
+            return await collect(url, lambda frames: sum(f[3] == 3 for f in frames) == 3)
+
+    frames = asyncio.run(scenario())
+    kinds = [(kind, generation, sample) for _, kind, generation, sample in frames]
+
+    interrupt_index = kinds.index(("interrupted", 1, None))
+    assert all(sample == 1 for _, _, sample in kinds[:interrupt_index])
+    assert kinds[interrupt_index + 1:] == [("audio", 2, 3)] * 3
+
+
+def test_interrupt_to_silence_latency(monkeypatch):
+    script = (
+        [model_audio(value=1) for _ in range(50)]
+        + [{"interrupted": True}]
+        + [model_audio(value=2) for _ in range(20)]
+        + [("sleep", 1.0)]
+    )
+
+    async def scenario():
+        async with FakeLiveServer(script) as fake, relay(monkeypatch, fake) as url:
+            frames = await collect(url, lambda frames: False, timeout=0.5)
+            return fake, frames
+
+    fake, frames = asyncio.run(scenario())
+    interrupted_at = next(sent for sent, payload in fake.sent_at if payload.get("interrupted"))
+    control_at = next(recv for recv, kind, _, _ in frames if kind == "interrupted")
+
+    # Silence is reached once the client has the control frame (it stops
+    # playback) and no cancelled-turn audio follows it
+    stale_after = [f for f in frames if f[1] == "audio" and f[0] > control_at]
+    assert stale_after == []
+
+    latency = control_at - interrupted_at
+    print(f"interrupt to silence: {latency * 1000:.1f}ms")
+    assert latency < MAX_INTERRUPT_TO_SILENCE_SECONDS
+
+
+def test_client_disconnect_closes_upstream_session(monkeypatch):
+    script = [model_audio() for _ in range(3)] + [("sleep", 0.2)] + [model_audio() for _ in range(20)]
+
+    async def scenario():
+        async with FakeLiveServer(script) as fake, relay(monkeypatch, fake) as url:
+            await collect(url, lambda frames: len(frames) == 1)
+            await asyncio.wait_for(fake.closed.wait(), 2.0)
+
+    asyncio.run(scenario())
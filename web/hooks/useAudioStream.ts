@@ -27,6 +27,8 @@ interface UseAudioStreamReturn {
 }
 
 const WS_URL = process.env.NEXT_PUBLIC_API_BASE_URL?.replace('http', 'ws') || 'ws://localhost:8000'
+// Send native-rate audio and let the server do high-quality resampling
+const SERVER_RESAMPLE = process.env.NEXT_PUBLIC_SERVER_RESAMPLE === 'true'
 
 export function useAudioStream(): UseAudioStreamReturn {
   const wsRef = useRef<WebSocket | null>(null)
@@ -35,12 +37,29 @@ export function useAudioStream(): UseAudioStreamReturn {
   const processorRef = useRef<ScriptProcessorNode | null>(null)
   const sourceRef = useRef<MediaStreamAudioSourceNode | null>(null)
   const nextPlayTimeRef = useRef<number>(0)
+  const playingSourcesRef = useRef<Set<AudioBufferSourceNode>>(new Set())
+  const generationRef = useRef<number>(0)
 
   const [connectionState, setConnectionState] = useState<ConnectionState>('disconnected')
   const [error, setError] = useState<string | null>(null)
   const [isSpeaking, setIsSpeaking] = useState(false)
 
+  // Stop all scheduled interviewer audio (e.g. when the candidate barges in)
+  const stopPlayback = useCallback(() => {
+    playingSourcesRef.current.forEach(source => {
+      try {
+        source.stop()
+      } catch {
+        // Source already stopped
+      }
+    })
+    playingSourcesRef.current.clear()
+    nextPlayTimeRef.current = 0
+  }, [])
+
   const disconnect = useCallback(() => {
+    stopPlayback()
+
     // Stop audio processing
     if (processorRef.current) {
       processorRef.current.disconnect()
@@ -72,8 +91,8 @@ export function useAudioStream(): UseAudioStreamReturn {
 
     setConnectionState('disconnected')
     setIsSpeaking(false)
-    nextPlayTimeRef.current = 0
-  }, [])
+    generationRef.current = 0
+  }, [stopPlayback])
 
   const connect = useCallback(async (jobData?: JobData | null) => {
     try {
@@ -100,17 +119,19 @@ export function useAudioStream(): UseAudioStreamReturn {
       sourceRef.current = source
 
       console.log('[Client] AudioContext sample rate:', audioContext.sampleRate)
-      console.log('[Client] Will resample to 16kHz for Gemini Live API')
+      console.log(SERVER_RESAMPLE
+        ? '[Client] Server will resample to 16kHz for Gemini Live API'
+        : '[Client] Will resample to 16kHz for Gemini Live API')
 
-      // Create WebSocket connection with job data as query params
-      let wsUrl = `${WS_URL}/ws/interview`
+      // Create WebSocket connection with job data and audio format as query params
+      const params = new URLSearchParams({
+        sample_rate: String(SERVER_RESAMPLE ? audioContext.sampleRate : 16000)
+      })
       if (jobData) {
-        const params = new URLSearchParams({
-          role: jobData.role || jobData.title || 'this position',
-          company: jobData.source || ''
-        })
-        wsUrl = `${wsUrl}?${params.toString()}`
+        params.set('role', jobData.role || jobData.title || 'this position')
+        params.set('company', jobData.source || '')
       }
+      const wsUrl = `${WS_URL}/ws/interview?${params.toString()}`
       console.log('Connecting to WebSocket:', wsUrl)
       const ws = new WebSocket(wsUrl)
       wsRef.current = ws
@@ -130,22 +151,26 @@ export function useAudioStream(): UseAudioStreamReturn {
             const inputData = e.inputBuffer.getChannelData(0)
 
             // Resample from audioContext.sampleRate to 16kHz for Gemini
-            const sourceSampleRate = audioContext.sampleRate
-            const targetSampleRate = 16000
-            const ratio = sourceSampleRate / targetSampleRate
-            const outputLength = Math.floor(inputData.length / ratio)
-            const resampled = new Float32Array(outputLength)
-
-            // Simple linear interpolation resampling
-            for (let i = 0; i < outputLength; i++) {
-              const sourceIndex = i * ratio
-              const index = Math.floor(sourceIndex)
-              const fraction = sourceIndex - index
-
-              if (index + 1 < inputData.length) {
-                resampled[i] = inputData[index] * (1 - fraction) + inputData[index + 1] * fraction
-              } else {
-                resampled[i] = inputData[index]
+            // (skipped when the server resamples the native-rate stream)
+            let resampled = inputData
+            if (!SERVER_RESAMPLE) {
+              const sourceSampleRate = audioContext.sampleRate
+              const targetSampleRate = 16000
+              const ratio = sourceSampleRate / targetSampleRate
+              const outputLength = Math.floor(inputData.length / ratio)
+              resampled = new Float32Array(outputLength)
+
+              // Simple linear interpolation resampling
+              for (let i = 0; i < outputLength; i++) {
+                const sourceIndex = i * ratio
+                const index = Math.floor(sourceIndex)
+                const fraction = sourceIndex - index
+
+                if (index + 1 < inputData.length) {
+                  resampled[i] = inputData[index] * (1 - fraction) + inputData[index + 1] * fraction
+                } else {
+                  resampled[i] = inputData[index]
+                }
               }
             }
 
@@ -172,9 +197,33 @@ export function useAudioStream(): UseAudioStreamReturn {
       }
 
       ws.onmessage = async (event) => {
+        // Control frames arrive as JSON text
+        if (typeof event.data === 'string') {
+          let control
+          try {
+            control = JSON.parse(event.data)
+          } catch {
+            console.warn('[Client] Ignoring malformed control frame:', event.data)
+            return
+          }
+          if (control?.type === 'interrupted' && typeof control.generation === 'number') {
+            console.log('[Client] Interrupted, stopping playback (generation', control.generation + ')')
+            generationRef.current = Math.max(generationRef.current, control.generation)
+            stopPlayback()
+          }
+          return
+        }
+
         // Receive audio from server and play it
-        if (event.data instanceof ArrayBuffer) {
-          const pcmData = new Int16Array(event.data)
+        // Frame layout: uint32 LE turn generation, then Int16 PCM
+        if (event.data instanceof ArrayBuffer && event.data.byteLength >= 4) {
+          const generation = new DataView(event.data).getUint32(0, true)
+          if (generation < generationRef.current) {
+            console.log('[Client] Dropping stale audio from generation', generation)
+            return
+          }
+
+          const pcmData = new Int16Array(event.data, 4)
           console.log('[Client] Received audio chunk:', pcmData.length, 'samples')
 
           // Convert Int16 PCM to Float32
@@ -195,6 +244,8 @@ export function useAudioStream(): UseAudioStreamReturn {
           const currentTime = audioContext.currentTime
           const startTime = Math.max(currentTime, nextPlayTimeRef.current)
 
+          playingSourcesRef.current.add(bufferSource)
+          bufferSource.onended = () => playingSourcesRef.current.delete(bufferSource)
           bufferSource.start(startTime)
           console.log('[Client] Playing audio at', startTime, 'duration', audioBuffer.duration)
 
@@ -218,6 +269,8 @@ export function useAudioStream(): UseAudioStreamReturn {
 
         if (event.code === 1008) {
           setError('GEMINI_API_KEY not configured on server')
+        } else if (event.code === 1003) {
+          setError(`Unsupported audio format: ${event.reason}`)
         } else if (event.code === 1011) {
           setError(`Server error: ${event.reason}`)
         } else if (!event.wasClean) {
@@ -245,7 +298,7 @@ export function useAudioStream(): UseAudioStreamReturn {
       setConnectionState('error')
       disconnect()
     }
-  }, [disconnect])
+  }, [disconnect, stopPlayback])
 
   // Cleanup on unmount
   useEffect(() => {